@@ -1,11 +1,88 @@
 import pandas as pd
 import numpy as np
-import json
 import os
 import yaml
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from dateutil import tz
-from typing import Dict, List, Optional, Tuple, Any
+from functools import lru_cache
+from itertools import repeat
+from operator import itemgetter
+from typing import (
+    AbstractSet,
+    Any,
+    BinaryIO,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+try:
+    # orjson is an optional dependency which parses JSON considerably faster
+    # than the standard library and accepts bytes directly
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+try:
+    # the libyaml based loader is much faster than the pure Python one, but is
+    # only available if PyYAML was built against libyaml
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+try:
+    # ijson is an optional dependency for parsing large JSON files
+    # incrementally
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    # pyarrow is an optional dependency providing a faster CSV writer and
+    # Parquet support
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+    from pyarrow import parquet as pa_parquet
+except ImportError:
+    pa = None
+
+# Number of seconds between 1970-01-01T00:00:00Z and 2001-01-01T00:00:00Z, the
+# reference date of Apple timestamps
+_APPLE_EPOCH_OFFSET = 978307200
+
+_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Resolving the local timezone inspects the system configuration, so it is
+# only done once at import time
+_LOCAL_TZ = tz.tzlocal()
+
+# Maximum number of threads used to write CSV files concurrently with pyarrow
+_MAX_WRITE_WORKERS = 8
+
+# Required fields of a reflection instance, fetched together in one call.
+# "notes" and "timeRecorded" are optional.
+_get_reflection_fields = itemgetter("name", "date", "id", "metrics")
+
+# Columns added to every reflection row which do not hold metric values
+_NON_METRIC_COLUMNS = frozenset(("Timestamp", "Date", "ID", "Notes"))
+
+# Metric kinds holding text values, which can be stored as categoricals
+_TEXT_KINDS = frozenset(("string", "choice"))
+
+# Maps each metric kind to the field holding the recorded value
+_KIND_FIELD = {
+    "string": "string",
+    "choice": "choice",
+    "bool": "bool",
+    "unit": "value",
+    "rating": "score",
+    "scalar": "scalar",
+}
 
 
 class ParsingOptions:
@@ -17,8 +94,19 @@ class ParsingOptions:
     3. The value to use if a metric has been removed from subsequent reflection
        instances.
     These defaults can be updated using a YAML file.
+
+    Optionally, text columns with few distinct values can be stored as
+    categoricals to reduce the memory usage of the DataFrames, see
+    `categorical_threshold`.
     """
 
+    __slots__ = (
+        "defaults",
+        "pre_metric_defaults",
+        "post_metric_defaults",
+        "categorical_threshold",
+    )
+
     def __init__(self):
         """
         Initializes the default, pre_metric, and post_metric values for
@@ -48,16 +136,20 @@ class ParsingOptions:
             "rating": np.nan,
             "scalar": np.nan,
         }
+        # The Notes column and string and choice metric columns are converted
+        # to categoricals if the ratio of distinct values to rows is below
+        # this threshold. None disables the conversion.
+        self.categorical_threshold = None
 
     def load_from_yaml(self, yaml_file: str):
         """
         Load the default values from a YAML file. The file should contain
         dictionaries for 'defaults', 'pre_metric_defaults', and
         'post_metric_defaults' where the keys are metric kinds and the values
-        are the default values.
+        are the default values, and optionally a 'categorical_threshold'.
         """
         with open(yaml_file, "r") as file:
-            new_defaults = yaml.safe_load(file)
+            new_defaults = yaml.load(file, Loader=_YamlLoader)
 
         self.defaults.update(new_defaults.get("defaults", {}))
         self.pre_metric_defaults.update(
@@ -66,6 +158,9 @@ class ParsingOptions:
         self.post_metric_defaults.update(
             new_defaults.get("post_metric_defaults", {})
         )
+        self.categorical_threshold = new_defaults.get(
+            "categorical_threshold", self.categorical_threshold
+        )
 
     def get_default_value(self, metric_kind: str):
         """Returns the default value for a given metric kind."""
@@ -106,6 +201,12 @@ class ParsingOptions:
             )
             raise
 
+@lru_cache(maxsize=4096)
+def _format_local(timestamp: int) -> str:
+    """Formats a Unix timestamp in local time as "YYYY-MM-DD HH:MM:SS"."""
+    return datetime.fromtimestamp(timestamp, _LOCAL_TZ).strftime(_DATE_FORMAT)
+
+
 def convert_timestamp(apple_timestamp: float) -> str:
     """
     Convert an Apple-style timestamp to a local time string.
@@ -117,16 +218,34 @@ def convert_timestamp(apple_timestamp: float) -> str:
         str: The timestamp in local time as a string formatted as 
              "YYYY-MM-DD HH:MM:SS".
     """
-    # Convert the Apple timestamp to a Python timestamp
-    # 978307200 is the number of seconds between 1970-01-01T00:00:00Z and 
-    # 2001-01-01T00:00:00Z
-    timestamp = int(apple_timestamp) + 978307200
+    # Convert the Apple timestamp to a Python timestamp and format it in the
+    # local timezone. Formatting is cached per second since reflections
+    # frequently share timestamps.
+    return _format_local(int(apple_timestamp) + _APPLE_EPOCH_OFFSET)
+
 
-    # Convert the timestamp to datetime and adjust it to the local timezone
-    local_tz = tz.tzlocal()
-    local_datetime = datetime.fromtimestamp(timestamp).astimezone(local_tz)
+def convert_timestamps(apple_timestamps: Any) -> np.ndarray:
+    """
+    Convert an array of Apple-style timestamps to local time strings.
 
-    return local_datetime.strftime("%Y-%m-%d %H:%M:%S")
+    This is the vectorized equivalent of `convert_timestamp`, converting the
+    whole array in a single pass instead of one datetime per timestamp.
+
+    Args:
+        apple_timestamps (array-like): The Apple timestamps to convert.
+
+    Returns:
+        np.ndarray: The timestamps in local time as strings formatted as
+             "YYYY-MM-DD HH:MM:SS".
+    """
+    seconds = (
+        np.asarray(apple_timestamps, dtype=np.float64).astype(np.int64)
+        + _APPLE_EPOCH_OFFSET
+    )
+    local_datetimes = pd.to_datetime(seconds, unit="s", utc=True).tz_convert(
+        _LOCAL_TZ
+    )
+    return local_datetimes.strftime(_DATE_FORMAT).to_numpy()
 
 
 def parse_metric_value(
@@ -147,36 +266,23 @@ def parse_metric_value(
         KeyError: If "kind" key does not exist in the metric.
         ValueError: If "kind" key exists but its value is empty.
     """
-    if "kind" not in metric or not metric["kind"]:
+    kind_dict = metric.get("kind")
+    if not kind_dict:
         raise KeyError(f'"kind" not found in metric: {metric}')
 
-    metric_kind = list(metric["kind"].keys())[0]
-    metric_content = metric["kind"][metric_kind]
+    metric_kind, metric_content = next(iter(kind_dict.items()))
 
     if metric_content is None:
         raise ValueError(f"unexpected metric contents in JSON: {metric}")
 
     metric_name = metric_content.get("name")
     if metric_name is not None:
-        try:
-            if metric_kind == "string":
-                value = metric_content["string"]
-            elif metric_kind == "choice":
-                value = metric_content["choice"]
-            elif metric_kind == "bool":
-                value = metric_content["bool"]
-            elif metric_kind == "unit":
-                value = metric_content["value"]
-            elif metric_kind == "rating":
-                value = metric_content["score"]
-            elif metric_kind == "scalar":
-                value = metric_content["scalar"]
-            else:
-                print(f"unsupported metric kind: {metric_kind}")
-                return None
-        except KeyError:
-            # this happens if the metric content is empty
-            value = None
+        value_field = _KIND_FIELD.get(metric_kind)
+        if value_field is None:
+            print(f"unsupported metric kind: {metric_kind}")
+            return None
+        # the value is missing if the metric content is empty
+        value = metric_content.get(value_field)
 
         return metric_name, metric_kind, value
 
@@ -186,8 +292,9 @@ def parse_metric_value(
 def parse_metrics(
     metrics: List[Dict[str, Any]],
     parsing_options: ParsingOptions,
-    existing_columns: List[str],
+    existing_columns: Iterable[str],
     metric_type_map: Dict[str, str],
+    metric_names: Optional[AbstractSet[str]] = None,
 ) -> Dict[str, Any]:
     """
     Parse the metrics from a reflection instance into a dictionary.
@@ -195,21 +302,41 @@ def parse_metrics(
     Args:
         metrics (list): A list of metrics in a reflection instance.
         parsing_options (ParsingOptions): The default value options.
-        existing_columns (List[str]): List of existing columns in the DataFrame
+        existing_columns (Iterable[str]): The existing columns in the DataFrame
             for the reflection.
         metric_type_map (Dict[str, str]): Dictionary to keep track of metric
             type changes.
+        metric_names (set, optional): The names of the metrics to parse. Other
+            metrics are skipped. Defaults to None, which parses all metrics.
 
     Returns:
         dict: A dictionary with metric names as keys and metric values as values.
     """
-    metric_dict = {}
+    # Check if a metric was removed from the template. If the metric is present
+    # in the reflection at the time it was recorded, we have an implicit
+    # representation of the template at that point in time, so any metric name
+    # that was present in the previous instances but is not present in this
+    # reflection means that the metric was removed at some point in time.
+    # Start from the post_metric_default of every existing metric, which the
+    # metrics present in this reflection then overwrite. This also sizes the
+    # dictionary for the known columns up front.
+    post_metric_defaults = parsing_options.post_metric_defaults
+    metric_dict = {
+        column: post_metric_defaults[metric_type_map[column]]
+        for column in existing_columns
+        if column not in _NON_METRIC_COLUMNS
+    }
+    # read the defaults directly rather than through get_default_value, as
+    # this runs for every metric that was not recorded
+    defaults = parsing_options.defaults
 
     for metric in metrics:
         result = parse_metric_value(metric)
 
         if result is not None:
             metric_name, metric_kind, metric_val = result
+            if metric_names is not None and metric_name not in metric_names:
+                continue
             if (
                 metric_name in metric_type_map
                 and metric_type_map[metric_name] != metric_kind
@@ -224,25 +351,7 @@ def parse_metrics(
             if metric_val is not None:
                 metric_dict[metric_name] = metric_val
             else:
-                metric_dict[metric_name] = parsing_options.get_default_value(
-                    metric_kind
-                )
-
-    # Check if a metric was removed from the template. If the metric is present
-    # in the reflection at the time it was recorded, we have an implicit
-    # representation of the template at that point in time, so any metric name
-    # that was present in the previous instances but is not present in this
-    # reflection means that the metric was removed at some point in time.
-    for column in existing_columns:
-        if column not in metric_dict and column not in [
-            "Timestamp",
-            "ID",
-            "Notes",
-            "Date",
-        ]:
-            metric_dict[column] = parsing_options.get_post_metric_default(
-                metric_type_map[column]
-            )
+                metric_dict[metric_name] = defaults[metric_kind]
 
     return metric_dict
 
@@ -250,101 +359,329 @@ def parse_metrics(
 def parse_reflection(
     reflection: Dict,
     parsing_options: ParsingOptions,
-    existing_df: pd.DataFrame = None,
+    existing_columns: Optional[Iterable[str]] = None,
     metric_type_map: Dict[str, str] = None,
-) -> Tuple[str, pd.DataFrame]:
+    metric_names: Optional[AbstractSet[str]] = None,
+) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
     """
-    Parses an individual reflection instance into a DataFrame, which is
-    appended as a row to the output CSV file for the reflection type.
+    Parses an individual reflection instance into a row dictionary, which is
+    appended as a row to the output CSV file for the reflection type. The
+    "Date" column is derived from the "Timestamp" column by `parse_json` for
+    all rows at once.
 
     Args:
         reflection (dict): A dictionary representing a reflection.
         parsing_options (ParsingOptions): The default value options.
-        existing_df (DataFrame, optional): The existing DataFrame for the
-            reflection. Defaults to None.
+        existing_columns (Iterable[str], optional): The columns already seen
+            for the reflection. Defaults to None.
         metric_type_map (Dict[str, str]): Dictionary to keep track of metric
             type changes.
+        metric_names (set, optional): The names of the metrics to parse.
+            Defaults to None, which parses all metrics.
 
     Returns:
-        Tuple[str, pd.DataFrame, Dict[str, str]]: The name of the reflection,
-        a DataFrame where each row corresponds to a reflection instance and
-        each column corresponds to a metric, and the updated metric type map.
+        Tuple[str, Dict[str, Any], Dict[str, str]]: The name of the reflection,
+        a dictionary mapping column names to the values of this reflection
+        instance, and the updated metric type map.
     """
-    name = reflection["name"]
-    apple_timestamp = reflection["timeRecorded"]
+    name, date, reflection_id, metrics = _get_reflection_fields(reflection)
+    # Histories exported without the time of recording fall back to the date
+    # of the reflection, which is also what reflections are sorted by
+    apple_timestamp = reflection.get("timeRecorded", date)
 
-    existing_columns = (
-        existing_df.columns.tolist() if existing_df is not None else []
-    )
     reflection_row = parse_metrics(
-        reflection["metrics"],
+        metrics,
         parsing_options,
-        existing_columns,
+        existing_columns if existing_columns is not None else [],
         metric_type_map,
+        metric_names,
     )
     reflection_row["Timestamp"] = apple_timestamp
-    reflection_row["Date"] = convert_timestamp(apple_timestamp)
-    reflection_row["ID"] = reflection["id"]
+    reflection_row["ID"] = reflection_id
     reflection_row["Notes"] = reflection.get("notes")
+    # The Date column is added by `parse_json` and replaces a metric of the
+    # same name, like the other reserved columns
+    reflection_row.pop("Date", None)
 
-    return name, pd.DataFrame([reflection_row]), metric_type_map
+    return name, reflection_row, metric_type_map
 
 
 def parse_json(
-    json_string: str, parsing_options: ParsingOptions
+    json_string: Union[str, bytes, List[Dict[str, Any]]],
+    parsing_options: ParsingOptions,
+    metric_names: Optional[Iterable[str]] = None,
 ) -> Dict[str, pd.DataFrame]:
     """
     Parses a JSON string into a map from reflection names to DataFrames.
 
     Args:
-        json_string (str): A JSON string.
+        json_string (str, bytes or list): A JSON string or UTF-8 encoded bytes,
+            or the already decoded list of reflection instances, which is
+            useful to parse the same history with different options without
+            decoding it again. The decoded instances are not modified.
         parsing_options (ParsingOptions): The default value options.
+        metric_names (Iterable[str], optional): The names of the metrics to
+            include. Other metrics are skipped without adding columns for
+            them; the Timestamp, Date, ID and Notes columns are always
+            included. Defaults to None, which includes all metrics.
 
     Returns:
         dict: A map where the keys are the reflection names and the values are
             DataFrames with a row for each instance of the reflection in the
             history JSON.
     """
-    data = json.loads(json_string)
+    if isinstance(json_string, (str, bytes, bytearray)):
+        data = _json.loads(json_string)
+    else:
+        data = json_string
+    return _parse_reflections(data, parsing_options, metric_names)
+
+
+def _parse_reflections(
+    data: List[Dict[str, Any]],
+    parsing_options: ParsingOptions,
+    metric_names: Optional[Iterable[str]] = None,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Parses a list of reflection instances into a map from reflection names to
+    DataFrames.
+
+    Args:
+        data (list): The reflection instances of a history JSON.
+        parsing_options (ParsingOptions): The default value options.
+        metric_names (Iterable[str], optional): The names of the metrics to
+            include. Defaults to None, which includes all metrics.
 
+    Returns:
+        dict: A map where the keys are the reflection names and the values are
+            DataFrames with a row for each instance of the reflection.
+    """
     # Sort the list of dictionaries by "date" in ascending order
     data = sorted(data, key=lambda x: x["date"], reverse=False)
 
-    reflections_map = {}
-    metric_type_map_map = {}  # track metric types
+    # Accumulate the values of each column in a list per reflection and build
+    # each DataFrame once at the end, instead of concatenating a growing
+    # DataFrame for every reflection instance.
+    columns_map: Dict[str, Dict[str, List[Any]]] = defaultdict(dict)
+    row_counts: Dict[str, int] = defaultdict(int)
+    # track metric types, updated in place by parse_reflection
+    metric_type_map_map: Dict[str, Dict[str, str]] = defaultdict(dict)
+    pre_metric_defaults = parsing_options.pre_metric_defaults
+    if metric_names is not None:
+        metric_names = frozenset(metric_names)
 
     for reflection in data:
-        existing_df = reflections_map.get(reflection["name"])
-        metric_type_map = metric_type_map_map.get(reflection["name"], {})
-        name, df, metric_type_map = parse_reflection(
-            reflection, parsing_options, existing_df, metric_type_map
+        name = reflection["name"]
+        columns = columns_map[name]
+        metric_type_map = metric_type_map_map[name]
+        name, row, metric_type_map = parse_reflection(
+            reflection,
+            parsing_options,
+            columns,
+            metric_type_map,
+            metric_names,
         )
-        if name in reflections_map:
-            new_columns = set(df.columns) - set(reflections_map[name].columns)
-            for column in new_columns:
-                if column in metric_type_map:
-                    # Fill the existing dataframe with pre_metric_default
-                    # values for new columns
-                    reflections_map[name][
-                        column
-                    ] = parsing_options.get_pre_metric_default(
-                        metric_type_map[column]
-                    )
-            reflections_map[name] = pd.concat(
-                [reflections_map[name], df], ignore_index=True,
+        num_rows = row_counts[name]
+        for column, value in row.items():
+            # a single lookup per value instead of a membership test followed
+            # by indexing
+            values = columns.get(column)
+            if values is None:
+                # Fill the previous rows with pre_metric_default values for
+                # new columns
+                values = columns[column] = (
+                    [pre_metric_defaults[metric_type_map[column]]] * num_rows
+                    if num_rows
+                    else []
+                )
+            values.append(value)
+        row_counts[name] = num_rows + 1
+
+    categorical_threshold = parsing_options.categorical_threshold
+    reflections_map = {}
+    for name, columns in columns_map.items():
+        if categorical_threshold is not None:
+            _categorize_columns(
+                columns,
+                metric_type_map_map[name],
+                row_counts[name],
+                categorical_threshold,
             )
-        else:
-            reflections_map[name] = df
-        # update metric type map for that reflection
-        metric_type_map_map[name] = metric_type_map
+        df = pd.DataFrame(columns)
+        # Convert the timestamps of all rows at once
+        df.insert(
+            df.columns.get_loc("Timestamp") + 1,
+            "Date",
+            convert_timestamps(columns["Timestamp"]),
+        )
+        reflections_map[name] = df
 
     return reflections_map
 
 
+def _categorize_columns(
+    columns: Dict[str, Any],
+    metric_type_map: Dict[str, str],
+    num_rows: int,
+    threshold: float,
+) -> None:
+    """
+    Replaces the value lists of the Notes column and of string and choice
+    metric columns with categoricals, if the ratio of distinct values to rows
+    is below the threshold.
+    """
+    for column, values in columns.items():
+        if column != "Notes" and metric_type_map.get(column) not in _TEXT_KINDS:
+            continue
+        try:
+            num_distinct = len(set(values))
+        except TypeError:
+            # unhashable values, e.g. multiple choices stored as lists
+            continue
+        if num_distinct < threshold * num_rows:
+            columns[column] = pd.Categorical(values)
+
+
+def parse_json_file(
+    json_path: str,
+    parsing_options: ParsingOptions,
+    metric_names: Optional[Iterable[str]] = None,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Parses a JSON file into a map from reflection names to DataFrames.
+
+    The file is read as bytes and passed to the JSON parser directly, which
+    avoids decoding it into an intermediate string.
+
+    Args:
+        json_path (str): Path to the JSON reflections file.
+        parsing_options (ParsingOptions): The default value options.
+        metric_names (Iterable[str], optional): The names of the metrics to
+            include. Other metrics are skipped without adding columns for
+            them; the Timestamp, Date, ID and Notes columns are always
+            included. Defaults to None, which includes all metrics.
+
+    Returns:
+        dict: A map where the keys are the reflection names and the values are
+            DataFrames with a row for each instance of the reflection in the
+            history JSON.
+    """
+    with open(json_path, "rb") as file:
+        return parse_json(file.read(), parsing_options, metric_names)
+
+
+def parse_json_stream(
+    json_file: Union[str, BinaryIO],
+    parsing_options: ParsingOptions,
+    metric_names: Optional[Iterable[str]] = None,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Parses a JSON file into a map from reflection names to DataFrames,
+    reading the reflections incrementally with ijson.
+
+    Unlike `parse_json_file`, the JSON text is never held in memory as a
+    whole, which keeps the peak memory usage down for very large histories.
+    The reflection instances themselves are still collected before parsing,
+    since they are processed in date order.
+
+    Args:
+        json_file (str or file): Path to the JSON reflections file, or a file
+            object opened in binary mode.
+        parsing_options (ParsingOptions): The default value options.
+        metric_names (Iterable[str], optional): The names of the metrics to
+            include. Other metrics are skipped without adding columns for
+            them; the Timestamp, Date, ID and Notes columns are always
+            included. Defaults to None, which includes all metrics.
+
+    Returns:
+        dict: A map where the keys are the reflection names and the values are
+            DataFrames with a row for each instance of the reflection in the
+            history JSON.
+
+    Raises:
+        ImportError: If ijson is not installed.
+    """
+    if ijson is None:
+        raise ImportError("ijson is required for parse_json_stream")
+
+    if hasattr(json_file, "read"):
+        data = list(ijson.items(json_file, "item", use_float=True))
+    else:
+        with open(json_file, "rb") as file:
+            data = list(ijson.items(file, "item", use_float=True))
+
+    return _parse_reflections(data, parsing_options, metric_names)
+
+
+def _to_arrow_table(df: pd.DataFrame, flatten: bool = False) -> "pa.Table":
+    """
+    Converts a DataFrame to a pyarrow Table.
+
+    Object columns which pyarrow cannot convert, such as the values of a
+    metric whose kind changed within the history (e.g. ratings followed by
+    bools), are converted to strings, keeping missing values. With `flatten`,
+    nested columns such as lists of choices are converted to strings as well,
+    for formats like CSV which only hold flat values.
+    """
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        pass
+    else:
+        if not flatten or not any(
+            pa.types.is_nested(field.type) for field in table.schema
+        ):
+            return table
+
+    converted = {}
+    for column in df.columns[df.dtypes == object]:
+        values = df[column]
+        try:
+            array = pa.array(values, from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+        else:
+            if not (flatten and pa.types.is_nested(array.type)):
+                continue
+        converted[column] = values.where(values.isna(), values.astype(str))
+    return pa.Table.from_pandas(df.assign(**converted), preserve_index=False)
+
+
+def _write_csv(df: pd.DataFrame, path: str, engine: str) -> None:
+    """Writes a DataFrame to a CSV file with the given engine."""
+    if engine == "pandas":
+        df.to_csv(path, index=False)
+    elif engine == "pyarrow":
+        if pa is None:
+            raise ImportError('pyarrow is required for engine="pyarrow"')
+        pa_csv.write_csv(_to_arrow_table(df, flatten=True), path)
+    else:
+        raise ValueError(
+            f"Invalid engine: {engine}. Choose from 'pandas', 'pyarrow'."
+        )
+
+
+def _select_names(
+    reflections_map: Dict[str, pd.DataFrame], filter_list: Optional[List[str]]
+) -> List[str]:
+    """
+    Returns the names of the reflections to save, in the order of filter_list
+    if given.
+    """
+    if filter_list is None:
+        return list(reflections_map)
+    # look up the requested names instead of scanning the filter list for
+    # every reflection; dict.fromkeys drops duplicate names
+    return [
+        name for name in dict.fromkeys(filter_list) if name in reflections_map
+    ]
+
+
 def save_dataframes_to_csv(
     reflections_map: Dict[str, pd.DataFrame],
     output_folder: str,
     filter_list: Optional[List[str]] = None,
+    engine: str = "pandas",
 ) -> None:
     """
     Saves each DataFrame in the reflections_map to a CSV file.
@@ -356,13 +693,79 @@ def save_dataframes_to_csv(
             saved.
         filter_list (list, optional): A list of reflection names. Only the
             reflections with names in this list will be saved. Defaults to None.
+        engine (str, optional): The CSV writer to use, either 'pandas' or
+            'pyarrow'. The pyarrow writer is implemented in C++ and is
+            considerably faster for large reflections, but formats values
+            differently (e.g. booleans as true/false and quoted strings).
+            Defaults to 'pandas'.
 
     Returns:
         None
     """
-    if filter_list is not None:
-        reflections_map = {
-            k: v for k, v in reflections_map.items() if k in filter_list
-        }
-    for name, df in reflections_map.items():
-        df.to_csv(os.path.join(output_folder, f"{name}.csv"), index=False)
+    names = _select_names(reflections_map, filter_list)
+    if not names:
+        return
+
+    paths = [os.path.join(output_folder, f"{name}.csv") for name in names]
+    if engine != "pyarrow":
+        # DataFrame.to_csv formats the values while holding the GIL, so
+        # writing from several threads would not overlap any work
+        for name, path in zip(names, paths):
+            _write_csv(reflections_map[name], path, engine)
+        return
+
+    # Each reflection is written to its own file, so the writes are
+    # independent, and the pyarrow writer releases the GIL while formatting
+    # and writing, so they can overlap
+    with ThreadPoolExecutor(
+        max_workers=min(_MAX_WRITE_WORKERS, len(paths))
+    ) as executor:
+        # consume the results to propagate any exception raised by a write
+        list(
+            executor.map(
+                _write_csv,
+                (reflections_map[name] for name in names),
+                paths,
+                repeat(engine),
+            )
+        )
+
+
+def save_dataframes_to_parquet(
+    reflections_map: Dict[str, pd.DataFrame],
+    output_folder: str,
+    filter_list: Optional[List[str]] = None,
+    compression: str = "zstd",
+) -> None:
+    """
+    Saves each DataFrame in the reflections_map to a Parquet file.
+
+    Parquet keeps the column types and is much smaller and faster to write and
+    read than CSV, which makes it preferable for large histories.
+
+    Args:
+        reflections_map (dict): A map where the keys are the reflection names
+            and the values are DataFrames.
+        output_folder (str): The path to the folder where the Parquet files
+            will be saved.
+        filter_list (list, optional): A list of reflection names. Only the
+            reflections with names in this list will be saved. Defaults to None.
+        compression (str, optional): The Parquet compression codec, e.g.
+            'zstd', 'snappy' or 'none'. Defaults to 'zstd'.
+
+    Returns:
+        None
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    if pa is None:
+        raise ImportError("pyarrow is required for save_dataframes_to_parquet")
+
+    for name in _select_names(reflections_map, filter_list):
+        table = _to_arrow_table(reflections_map[name])
+        pa_parquet.write_table(
+            table,
+            os.path.join(output_folder, f"{name}.parquet"),
+            compression=compression,
+        )
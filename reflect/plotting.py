@@ -43,21 +43,17 @@ def plot(
     
     # Resample the data if frequency is not None
     if frequency is not None:
+        if sampling_method not in ('mean', 'min', 'max'):
+            raise ValueError("Invalid method. Choose from 'mean', 'min', 'max'.")
+
         # Convert frequency string to pandas offset alias.
         # Use the original string if it's not found in freq_dict
         # which allows custom frequencies, e.g. 3D for 3 days, 3W for 3 weeks, 
         # etc.
         resample_frequency = freq_dict.get(frequency, frequency)
         
-        # Resample the data
-        if sampling_method == 'mean':
-            df = df.resample(resample_frequency).mean()
-        elif sampling_method == 'min':
-            df = df.resample(resample_frequency).min()
-        elif sampling_method == 'max':
-            df = df.resample(resample_frequency).max()
-        else:
-            raise ValueError("Invalid method. Choose from 'mean', 'min', 'max'.")
+        # Resample the data with the aggregation named by sampling_method
+        df = getattr(df.resample(resample_frequency), sampling_method)()
     
     # Plot all metrics on the same plot if max_metrics_per_subplot is None
     if max_metrics_per_subplot is None:
@@ -131,20 +127,17 @@ def filtered_correlation_plot(df: pd.DataFrame, title: str = "") -> pd.DataFrame
     plt.xticks(rotation=90)
     plt.yticks(rotation=0)
 
-    # Filter the correlation values
-    corr_filtered = corr.copy()
-    for i in range(corr_filtered.shape[0]):
-        for j in range(corr_filtered.shape[1]):
-            value = corr_filtered.iloc[i, j]
-            sign = np.sign(value)
-            if abs(value) < 0.1:
-                corr_filtered.iloc[i, j] = 0
-            elif abs(value) < 0.3:
-                corr_filtered.iloc[i, j] = sign * 0.2
-            elif abs(value) < 0.5:
-                corr_filtered.iloc[i, j] = sign * 0.4
-            else:
-                corr_filtered.iloc[i, j] = sign * 0.8
+    # Filter the correlation values by bucketing their magnitudes, keeping
+    # the original sign. NaN values fall into the last bucket and stay NaN.
+    values = corr.to_numpy()
+    buckets = np.array([0, 0.2, 0.4, 0.8])
+    magnitudes = buckets[np.digitize(np.abs(values), [0.1, 0.3, 0.5])]
+    # adding 0 turns the -0.0 of small negative correlations into 0.0
+    corr_filtered = pd.DataFrame(
+        np.sign(values) * magnitudes + 0,
+        index=corr.index,
+        columns=corr.columns,
+    )
 
     # Create the second subplot
     plt.subplot(1, 2, 2)
@@ -41,47 +41,39 @@ def find_outliers(
         replaced with NaN, and columns without outliers removed.
     """
 
-    df_outliers = df.copy()
-    numerical_cols = df_outliers.select_dtypes(
-        include=np.number
-    ).columns.tolist()
-    cols_to_drop = []
+    numerical = df.select_dtypes(include=np.number)
+    numerical_cols = numerical.columns.tolist()
 
-    for col in numerical_cols:
-        # Calculate rolling mean and std
-        mean = (
-            df_outliers[col]
-            .rolling(
-                window=time_window, center=center, min_periods=min_periods
-            )
-            .mean()
-        )
-        std = (
-            df_outliers[col]
-            .rolling(
-                window=time_window, center=center, min_periods=min_periods
-            )
-            .std()
-        )
+    # Calculate rolling mean and std of all numerical columns in one pass
+    rolling = numerical.rolling(
+        window=time_window, center=center, min_periods=min_periods
+    )
+    mean = rolling.mean()
+    std = rolling.std()
 
-        # Calculate Z-Scores
-        zscore = (df_outliers[col] - mean) / std
+    # Calculate Z-Scores
+    zscore = (numerical - mean) / std
 
-        # Detect outliers using Z-Score
-        df_outliers[col] = np.where(
-            (np.abs(zscore) > z_threshold) & (std > 0),
-            df_outliers[col],
-            np.nan,
-        )
+    # Detect outliers using Z-Score
+    numerical_outliers = numerical.where(
+        (zscore.abs() > z_threshold) & (std > 0)
+    ).astype(np.float64)
 
+    cols_to_drop = []
+    for col in numerical_cols:
         # Print Date, mean, and outlier value for detected outliers
-        outliers = df_outliers.loc[df_outliers[col].notna(), [col]]
+        outliers = numerical_outliers.loc[
+            numerical_outliers[col].notna(), [col]
+        ]
         if not outliers.empty:
             print(f"\nOutliers for column '{col}':\n")
             print(outliers)
         else:
             cols_to_drop.append(col)
 
-    # Remove columns without outliers
-    df_outliers.drop(cols_to_drop, axis=1, inplace=True)
+    # Remove columns without outliers before copying the input, so that only
+    # the remaining columns are copied, then fill in the outlier values
+    df_outliers = df.drop(cols_to_drop, axis=1)
+    outlier_cols = [col for col in numerical_cols if col not in cols_to_drop]
+    df_outliers[outlier_cols] = numerical_outliers[outlier_cols]
     return df_outliers
@@ -1,7 +1,83 @@
 import argparse
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+from importlib import metadata
+
+import pandas as pd
+
 from reflect import conversions as conv
 
 
+def _package_version():
+    """Returns the installed version of reflect-utils, if any."""
+    try:
+        return metadata.version('reflect-utils')
+    except metadata.PackageNotFoundError:
+        return 'unknown'
+
+
+def get_cache_path(json_path, options_file=None):
+    """
+    Returns the path of the cache file for the parsed reflections.
+
+    The cache key is derived from the absolute path, modification time and size
+    of the JSON file, the contents of the optional YAML options file, the
+    local timezone the Date column is formatted in, and the versions of
+    reflect-utils and pandas, so that any change to the inputs or to the code
+    producing the DataFrames results in a new cache entry.
+    """
+    stat = os.stat(json_path)
+    key = hashlib.sha256(os.path.abspath(json_path).encode())
+    key.update(f'{stat.st_mtime_ns}:{stat.st_size}'.encode())
+    if options_file:
+        with open(options_file, 'rb') as f:
+            key.update(f.read())
+    # the local timezone is derived from these by dateutil's tzlocal
+    key.update(repr((os.environ.get('TZ'), time.tzname, time.timezone, time.altzone)).encode())
+    key.update(f'{_package_version()}:{pd.__version__}'.encode())
+    # the version of an editable install does not change with the code
+    with open(conv.__file__, 'rb') as f:
+        key.update(f.read())
+
+    cache_home = os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache'))
+    return os.path.join(cache_home, 'reflect', f'{key.hexdigest()}.pkl')
+
+
+def load_cache(cache_path):
+    """
+    Returns the reflections map stored in the cache file, or None if there is
+    no usable cache entry.
+    """
+    try:
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        # a missing, truncated or incompatible cache entry, e.g. one pickled
+        # with another pandas version, is treated as a cache miss
+        return None
+
+
+def save_cache(cache_path, reflections_map):
+    """
+    Stores the reflections map in the cache file. The map is written to a
+    temporary file first and then moved into place, so that an interrupted run
+    never leaves a truncated cache entry behind.
+    """
+    cache_dir = os.path.dirname(cache_path)
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(reflections_map, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
 def main():
     """
     Parses a JSON file of reflections into separate CSV files.
@@ -18,27 +94,53 @@ def main():
     - reflections: Optional list of reflection names to save. If not provided, 
         all reflections will be saved.
     - options_file: Optional YAML file with parsing options.
+    - engine: Optional CSV writer, either 'pandas' (default) or 'pyarrow'.
+    - stream: Optional flag to parse the JSON file incrementally with ijson,
+        which reduces the memory usage for very large files.
+    - cache: Optional flag to cache the parsed reflections, so that running
+        the script again on an unchanged file, e.g. with a different list of
+        reflections, skips parsing.
+    - format: Optional output format, either 'csv' (default) or 'parquet'.
     """
     parser = argparse.ArgumentParser(description='Parse JSON reflections and save to CSV.')
     parser.add_argument('json_path', type=str, help='Path to the JSON reflections file.')
     parser.add_argument('output_dir', type=str, help='Output directory for CSV files.')
     parser.add_argument('-r', '--reflections', nargs='*', help='Optional list of reflection names to save.')
     parser.add_argument('-o', '--options_file', type=str, default=None, help='YAML file with parsing options.')
+    parser.add_argument('-e', '--engine', choices=['pandas', 'pyarrow'], default='pandas', help='CSV writer to use.')
+    parser.add_argument('-s', '--stream', action='store_true',
+                        help='Parse the JSON file incrementally to reduce memory usage (requires ijson).')
+    parser.add_argument('-c', '--cache', action='store_true', help='Cache the parsed reflections in ~/.cache/reflect.')
+    parser.add_argument('-f', '--format', choices=['csv', 'parquet'], default='csv',
+                        help='Output file format (parquet requires pyarrow).')
 
     args = parser.parse_args()
 
-    with open(args.json_path, 'r') as f:
-        json_string = f.read()
+    reflections_map = None
+    if args.cache:
+        cache_path = get_cache_path(args.json_path, args.options_file)
+        # fall back to parsing if there is no usable cache entry
+        reflections_map = load_cache(cache_path)
 
-    if args.options_file:
-        with open(args.options_file, 'r') as f:
-            options_yaml = f.read()
-        options = conv.load_parsing_options_from_yaml(options_yaml)
-    else:
+    if reflections_map is None:
         options = conv.ParsingOptions()
+        if args.options_file:
+            options.load_from_yaml(args.options_file)
+
+        if args.stream:
+            reflections_map = conv.parse_json_stream(args.json_path, options)
+        else:
+            # Read the file as bytes, which orjson parses without decoding to str first
+            reflections_map = conv.parse_json_file(args.json_path, options)
 
-    reflections_map = conv.parse_json(json_string, options)
-    conv.save_dataframes_to_csv(reflections_map, args.output_dir, args.reflections)
+        if args.cache:
+            save_cache(cache_path, reflections_map)
+
+    # The filter is applied when saving, so the cache covers all reflections
+    if args.format == 'parquet':
+        conv.save_dataframes_to_parquet(reflections_map, args.output_dir, args.reflections)
+    else:
+        conv.save_dataframes_to_csv(reflections_map, args.output_dir, args.reflections, args.engine)
 
 if __name__ == "__main__":
     main()
@@ -1,12 +1,267 @@
 import unittest
+import io
+import json
 import os
+import tempfile
+from unittest import mock
 import pandas as pd
 import numpy as np
+from dateutil import tz
 from pandas.testing import assert_frame_equal
 
 from reflect import conversions as conv
 
 
+# Format dates in a fixed timezone with summer time, so that the expected Date
+# strings do not depend on the timezone of the machine running the tests
+_local_tz_patcher = mock.patch.object(
+    conv, "_LOCAL_TZ", tz.gettz("Europe/Berlin")
+)
+
+
+def setUpModule():
+    _local_tz_patcher.start()
+    # the formatted timestamps are cached independently of the timezone
+    conv._format_local.cache_clear()
+
+
+def tearDownModule():
+    _local_tz_patcher.stop()
+    conv._format_local.cache_clear()
+
+
+# Three instances of the "Mood" reflection, see TestParsingOptions
+MOOD_JSON = b"""
+[
+    {
+        "id": "id3",
+        "notes": "",
+        "name": "Mood",
+        "metrics": [
+            {
+                "group": "",
+                "id": "metric_id_4",
+                "kind": {
+                    "rating": {
+                        "name": "Elated",
+                        "score": 4
+                    }
+                }
+            }
+        ],
+        "date": 707954444.948071
+    },
+    {
+        "id": "id2",
+        "notes": "",
+        "name": "Mood",
+        "metrics": [
+            {
+                "group": "",
+                "id": "metric_id_3",
+                "kind": {
+                    "rating": {
+                        "name": "Perplexed"
+                    }
+                }
+            },
+            {
+                "group": "",
+                "id": "metric_id_2",
+                "kind": {
+                    "rating": {
+                        "name": "Elated",
+                        "score": 4
+                    }
+                }
+            }
+        ],
+        "date": 705867495.55896401
+    },
+    {
+        "id": "id1",
+        "notes": "",
+        "name": "Mood",
+        "metrics": [
+            {
+                "group": "",
+                "id": "metric_id1",
+                "kind": {
+                    "rating": {
+                        "name": "Perplexed",
+                        "score": 3
+                    }
+                }
+            }
+        ],
+        "date": 702429159.13179898
+    }
+]
+"""
+
+# Two instances of "Reflection1" and one of "Reflection2"
+REFLECTIONS_JSON = b"""
+[
+    {
+        "id": "id1",
+        "notes": "Note 3",
+        "name": "Reflection2",
+        "metrics": [
+            {
+                "group": "",
+                "id": "metric_id",
+                "kind": {
+                    "string": {
+                        "name": "String Metric 3",
+                        "string": "test_string"
+                    }
+                }
+            },
+            {
+                "group": "",
+                "id": "metric_id_2",
+                "kind": {
+                    "choice": {
+                        "name": "Choice Metric",
+                        "value": [
+                            "choice1",
+                            "choice2"
+                        ],
+                        "choice": "choice1"
+                    }
+                }
+            },
+            {
+                "group": "",
+                "id": "metric_id_3",
+                "kind": {
+                    "bool": {
+                        "name": "Bool Metric",
+                        "bool": true
+                    }
+                }
+            },
+            {
+                "group": "",
+                "id": "metric_id_4",
+                "kind": {
+                    "unit": {
+                        "name": "Unit Metric",
+                        "value": 15,
+                        "unit": "min"
+                    }
+                }
+            },
+            {
+                "group": "",
+                "id": "metric_id_5",
+                "kind": {
+                    "rating": {
+                        "name": "Rating Metric",
+                        "score": 5
+                    }
+                }
+            }
+        ],
+        "date": 707954444.948071
+    },
+    {
+        "id": "id2",
+        "notes": "Note 2",
+        "name": "Reflection1",
+        "metrics": [
+            {
+                "group": "",
+                "id": "metric_id_6",
+                "kind": {
+                    "string": {
+                        "name": "String Metric 1",
+                        "string": "string_2"
+                    }
+                }
+            },
+            {
+                "group": "",
+                "id": "metric_id_7",
+                "kind": {
+                    "scalar": {
+                        "name": "Scalar Metric 1",
+                        "scalar": 0
+                    }
+                }
+            }
+        ],
+        "date": 705867495.55896401
+    },
+    {
+        "id": "id3",
+        "notes": "Note 1",
+        "name": "Reflection1",
+        "metrics": [
+            {
+                "group": "",
+                "id": "metric_id_8",
+                "kind": {
+                    "string": {
+                        "name": "String Metric 1",
+                        "string": "string_1"
+                    }
+                }
+            },
+            {
+                "group": "",
+                "id": "metric_id_9",
+                "kind": {
+                    "scalar": {
+                        "name": "Scalar Metric 1",
+                        "scalar": 2
+                    }
+                }
+            }
+        ],
+        "date": 702429159.13179898
+    }
+]
+"""
+
+# Two instances of "Energy", recorded as a rating and then as a bool, which
+# results in an object column with mixed types
+KIND_CHANGE_REFLECTIONS = [
+    {
+        "id": "id1",
+        "name": "Energy",
+        "metrics": [{"kind": {"rating": {"name": "Energy", "score": 3}}}],
+        "date": 702429159.13179898,
+    },
+    {
+        "id": "id2",
+        "name": "Energy",
+        "metrics": [{"kind": {"bool": {"name": "Energy", "bool": True}}}],
+        "date": 705867495.55896401,
+    },
+]
+
+
+LIST_CHOICE_REFLECTIONS = [
+    {
+        "id": "id3",
+        "name": "Activities",
+        "metrics": [
+            {"kind": {"choice": {"name": "Activity", "choice": ["run", "swim"]}}}
+        ],
+        "date": 702429159.13179898,
+    },
+    {
+        "id": "id4",
+        "name": "Activities",
+        "metrics": [
+            {"kind": {"choice": {"name": "Activity", "choice": ["bike"]}}}
+        ],
+        "date": 705867495.55896401,
+    },
+]
+
+
 class TestParsingMetricValue(unittest.TestCase):
     """
     Tests the `parse_metric_value` function's ability to correctly extract the
@@ -15,18 +270,19 @@ class TestParsingMetricValue(unittest.TestCase):
     metric is present but is not recorded.
     """
 
-    def setUp(self):
-        self.metric_data = {
+    @classmethod
+    def setUpClass(cls):
+        cls.metric_data = {
             "kind": {"bool": {"name": "No Gi", "bool": False}},
             "id": "994FAC7F-FA9D-4B5E-9896-F72165F72A6C",
             "group": "Info",
         }
-        self.metric_no_kind = {
+        cls.metric_no_kind = {
             "_0": {"name": "No Gi", "bool": False},
             "id": "994FAC7F-FA9D-4B5E-9896-F72165F72A6C",
             "group": "Info",
         }
-        self.metric_not_recorded = {
+        cls.metric_not_recorded = {
             "kind": {"bool": {"name": "No Gi"}},
             "id": "994FAC7F-FA9D-4B5E-9896-F72165F72A6C",
             "group": "Info",
@@ -49,117 +305,137 @@ class TestParsingMetricValue(unittest.TestCase):
         self.assertEqual(value, None)
 
 
+class TestParseReflection(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.reflection = {
+            "id": "id1",
+            "name": "Mood",
+            "metrics": [
+                {"kind": {"rating": {"name": "Elated", "score": 4}}}
+            ],
+            "date": 702429159.13179898,
+        }
+        cls.parsing_options = conv.ParsingOptions()
+
+    def test_parse_reflection_time_recorded(self):
+        """The Timestamp is the time the reflection was recorded, if present"""
+        reflection = dict(self.reflection, timeRecorded=702429259.5)
+        name, row, metric_type_map = conv.parse_reflection(
+            reflection, self.parsing_options, metric_type_map={}
+        )
+        self.assertEqual(name, "Mood")
+        self.assertEqual(row["Timestamp"], 702429259.5)
+        self.assertEqual(row["Elated"], 4)
+        self.assertEqual(metric_type_map, {"Elated": "rating"})
+
+    def test_parse_reflection_no_time_recorded(self):
+        """Without the time of recording the Timestamp is the date"""
+        name, row, _ = conv.parse_reflection(
+            self.reflection, self.parsing_options, metric_type_map={}
+        )
+        self.assertEqual(name, "Mood")
+        self.assertEqual(row["Timestamp"], 702429159.13179898)
+        self.assertEqual(row["ID"], "id1")
+        self.assertIsNone(row["Notes"])
+
+    def test_parse_json_date_metric(self):
+        """A metric named like the Date column is replaced by the date"""
+        reflection = dict(
+            self.reflection,
+            metrics=[
+                {"kind": {"string": {"name": "Date", "string": "today"}}},
+                {"kind": {"scalar": {"name": "x", "scalar": 1}}},
+            ],
+        )
+        df = conv.parse_json([reflection], self.parsing_options)["Mood"]
+        self.assertListEqual(list(df["Date"]), ["2023-04-06 01:12:39"])
+        self.assertListEqual(list(df["x"]), [1])
+
+
+class TestConvertTimestamps(unittest.TestCase):
+    """
+    Tests the conversion of Apple timestamps to local time strings, in the
+    Europe/Berlin timezone pinned by setUpModule.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        # around midnight UTC on 2020-01-01 and the start and end of summer
+        # time in the EU
+        cls.timestamps = [
+            599529599.9,
+            599529600.0,
+            607136399.5,
+            607136400.0,
+            625280399.99,
+            625280400.0,
+        ]
+        cls.expected_dates = [
+            "2020-01-01 00:59:59",
+            "2020-01-01 01:00:00",
+            "2020-03-29 01:59:59",
+            "2020-03-29 03:00:00",
+            "2020-10-25 02:59:59",
+            "2020-10-25 02:00:00",
+        ]
+
+    def test_convert_timestamp(self):
+        self.assertListEqual(
+            [conv.convert_timestamp(ts) for ts in self.timestamps],
+            self.expected_dates,
+        )
+
+    def test_convert_timestamps(self):
+        self.assertListEqual(
+            list(conv.convert_timestamps(self.timestamps)),
+            self.expected_dates,
+        )
+
+
 class TestParsingOptions(unittest.TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """
-        Create a test JSON which has three reflection instances: (not reverse 
+        Uses a test JSON which has three reflection instances: (not reverse 
         chronological order in JSON)
         - one with metric "Perplexed"
         - new metric "Elated" is added, "Perplexed" is present but not recorded
         - "Perplexed" is removed, only "Elated" remains
         """
-        self.json_string = """
-        [
-            {
-                "id": "id3",
-                "notes": "",
-                "name": "Mood",
-                "metrics": [
-                    {
-                        "group": "",
-                        "id": "metric_id_4",
-                        "kind": {
-                            "rating": {
-                                "name": "Elated",
-                                "score": 4
-                            }
-                        }
-                    }
-                ],
-                "date": 707954444.948071
-            },
-            {
-                "id": "id2",
-                "notes": "",
-                "name": "Mood",
-                "metrics": [
-                    {
-                        "group": "",
-                        "id": "metric_id_3",
-                        "kind": {
-                            "rating": {
-                                "name": "Perplexed"
-                            }
-                        }
-                    },
-                    {
-                        "group": "",
-                        "id": "metric_id_2",
-                        "kind": {
-                            "rating": {
-                                "name": "Elated",
-                                "score": 4
-                            }
-                        }
-                    }
-                ],
-                "date": 705867495.55896401
-            },
-            {
-                "id": "id1",
-                "notes": "",
-                "name": "Mood",
-                "metrics": [
-                    {
-                        "group": "",
-                        "id": "metric_id1",
-                        "kind": {
-                            "rating": {
-                                "name": "Perplexed",
-                                "score": 3
-                            }
-                        }
-                    }
-                ],
-                "date": 702429159.13179898
-            }
-        ]
-        """
+        cls.json_string = MOOD_JSON
         ts3 = 707954444.948071
         ts2 = 705867495.55896401
         ts1 = 702429159.13179898
-        self.default_parsing_options = conv.ParsingOptions()
-        self.expected_df_default = pd.DataFrame(
+        dates = [
+            "2023-04-06 01:12:39",
+            "2023-05-15 20:18:15",
+            "2023-06-09 00:00:44",
+        ]
+        cls.default_parsing_options = conv.ParsingOptions()
+        cls.expected_df_default = pd.DataFrame(
             {
                 "Perplexed": [3.0, 0.0, np.nan],
                 "Elated": [np.nan, 4, 4],
                 "Timestamp": [ts1, ts2, ts3],
-                "Date": [
-                    conv.convert_timestamp(ts1),
-                    conv.convert_timestamp(ts2),
-                    conv.convert_timestamp(ts3),
-                ],
+                "Date": dates,
                 "ID": ["id1", "id2", "id3"],
                 "Notes": ["", "", ""],
             }
         )
 
-        self.custom_parsing_options = conv.ParsingOptions()
+        cls.custom_parsing_options = conv.ParsingOptions()
         # define some custom parsing options
-        self.custom_parsing_options.defaults["rating"] = 42
-        self.custom_parsing_options.pre_metric_defaults["rating"] = 0
-        self.custom_parsing_options.post_metric_defaults["rating"] = 1
+        cls.custom_parsing_options.defaults["rating"] = 42
+        cls.custom_parsing_options.pre_metric_defaults["rating"] = 0
+        cls.custom_parsing_options.post_metric_defaults["rating"] = 1
 
-        self.expected_df_custom = pd.DataFrame(
+        cls.expected_df_custom = pd.DataFrame(
             {
                 "Perplexed": [3, 42, 1],
                 "Elated": [0, 4, 4],
                 "Timestamp": [ts1, ts2, ts3],
-                "Date": [
-                    conv.convert_timestamp(ts1),
-                    conv.convert_timestamp(ts2),
-                    conv.convert_timestamp(ts3),
-                ],
+                "Date": dates,
                 "ID": ["id1", "id2", "id3"],
                 "Notes": ["", "", ""],
             }
@@ -167,160 +443,71 @@ class TestParsingOptions(unittest.TestCase):
 
     def test_parse_json_parsing_options(self):
         """Compare default and custom parsing options output."""
+        # decode the JSON once and parse it with both options
+        reflections = json.loads(self.json_string)
         reflections_map_default = conv.parse_json(
-            self.json_string, self.default_parsing_options
+            reflections, self.default_parsing_options
         )
         reflections_map_custom = conv.parse_json(
-            self.json_string, self.custom_parsing_options
+            reflections, self.custom_parsing_options
         )
 
         actual_df_default = reflections_map_default["Mood"]
         actual_df_custom = reflections_map_custom["Mood"]
-        print("default parsing options:")
-        print(f"expected:\n{self.expected_df_default}")
-        print(f"actual:\n{actual_df_default}")
-
         assert_frame_equal(
             actual_df_default, self.expected_df_default, check_like=True
         )
 
-        print("custom parsing options:")
-        print(f"expected:\n{self.expected_df_custom}")
-        print(f"actual:\n{actual_df_custom}")
         assert_frame_equal(
             actual_df_custom, self.expected_df_custom, check_like=True
         )
 
+    def test_parse_json_categorical_threshold(self):
+        parsing_options = conv.ParsingOptions()
+        parsing_options.categorical_threshold = 0.5
+        actual_df = conv.parse_json(self.json_string, parsing_options)["Mood"]
+
+        # the Notes are all empty, the IDs are not text metric columns
+        expected_df = self.expected_df_default.astype({"Notes": "category"})
+        assert_frame_equal(actual_df, expected_df, check_like=True)
+
+    def test_load_from_yaml(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            yaml_path = os.path.join(tmp_dir, "options.yaml")
+            with open(yaml_path, "w") as f:
+                f.write(
+                    "defaults:\n  rating: 42\n"
+                    "pre_metric_defaults:\n  rating: 0\n"
+                    "post_metric_defaults:\n  rating: 1\n"
+                    "categorical_threshold: 0.5\n"
+                )
+            parsing_options = conv.ParsingOptions()
+            parsing_options.load_from_yaml(yaml_path)
+
+        # only the given kinds are updated
+        default_parsing_options = conv.ParsingOptions()
+        self.assertDictEqual(
+            parsing_options.defaults,
+            {**default_parsing_options.defaults, "rating": 42},
+        )
+        self.assertEqual(parsing_options.get_pre_metric_default("rating"), 0)
+        self.assertEqual(parsing_options.get_post_metric_default("rating"), 1)
+        self.assertIsNone(parsing_options.get_pre_metric_default("string"))
+        self.assertEqual(parsing_options.categorical_threshold, 0.5)
+
+        actual_df = conv.parse_json(self.json_string, parsing_options)["Mood"]
+        expected_df = self.expected_df_custom.astype({"Notes": "category"})
+        assert_frame_equal(actual_df, expected_df, check_like=True)
+
 
 class TestJsonToCsvParsing(unittest.TestCase):
-    def setUp(self):
-        self.json_string = """
-        [
-            {
-                "id": "id1",
-                "notes": "Note 3",
-                "name": "Reflection2",
-                "metrics": [
-                    {
-                        "group": "",
-                        "id": "metric_id",
-                        "kind": {
-                            "string": {
-                                "name": "String Metric 3",
-                                "string": "test_string"
-                            }
-                        }
-                    },
-                    {
-                        "group": "",
-                        "id": "metric_id_2",
-                        "kind": {
-                            "choice": {
-                                "name": "Choice Metric",
-                                "value": [
-                                    "choice1",
-                                    "choice2"
-                                ],
-                                "choice": "choice1"
-                            }
-                        }
-                    },
-                    {
-                        "group": "",
-                        "id": "metric_id_3",
-                        "kind": {
-                            "bool": {
-                                "name": "Bool Metric",
-                                "bool": true
-                            }
-                        }
-                    },
-                    {
-                        "group": "",
-                        "id": "metric_id_4",
-                        "kind": {
-                            "unit": {
-                                "name": "Unit Metric",
-                                "value": 15,
-                                "unit": "min"
-                            }
-                        }
-                    },
-                    {
-                        "group": "",
-                        "id": "metric_id_5",
-                        "kind": {
-                            "rating": {
-                                "name": "Rating Metric",
-                                "score": 5
-                            }
-                        }
-                    }
-                ],
-                "date": 707954444.948071
-            },
-            {
-                "id": "id2",
-                "notes": "Note 2",
-                "name": "Reflection1",
-                "metrics": [
-                    {
-                        "group": "",
-                        "id": "metric_id_6",
-                        "kind": {
-                            "string": {
-                                "name": "String Metric 1",
-                                "string": "string_2"
-                            }
-                        }
-                    },
-                    {
-                        "group": "",
-                        "id": "metric_id_7",
-                        "kind": {
-                            "scalar": {
-                                "name": "Scalar Metric 1",
-                                "scalar": 0
-                            }
-                        }
-                    }
-                ],
-                "date": 705867495.55896401
-            },
-            {
-                "id": "id3",
-                "notes": "Note 1",
-                "name": "Reflection1",
-                "metrics": [
-                    {
-                        "group": "",
-                        "id": "metric_id_8",
-                        "kind": {
-                            "string": {
-                                "name": "String Metric 1",
-                                "string": "string_1"
-                            }
-                        }
-                    },
-                    {
-                        "group": "",
-                        "id": "metric_id_9",
-                        "kind": {
-                            "scalar": {
-                                "name": "Scalar Metric 1",
-                                "scalar": 2
-                            }
-                        }
-                    }
-                ],
-                "date": 702429159.13179898
-            }
-        ]
-        """
+    @classmethod
+    def setUpClass(cls):
+        cls.json_string = REFLECTIONS_JSON
         ts3 = 707954444.948071
         ts2 = 705867495.55896401
         ts1 = 702429159.13179898
-        self.expected_df_1 = pd.DataFrame(
+        cls.expected_df_1 = pd.DataFrame(
             {
                 "String Metric 3": ["test_string"],
                 "Choice Metric": ["choice1"],
@@ -330,29 +517,31 @@ class TestJsonToCsvParsing(unittest.TestCase):
                 ],  # the unit ("min") is not currently considered in parsing, only the value
                 "Rating Metric": [5],
                 "Timestamp": [ts3],
-                "Date": [
-                    conv.convert_timestamp(ts3),
-                ],
+                "Date": ["2023-06-09 00:00:44"],
                 "ID": ["id1"],
                 "Notes": ["Note 3"],
             }
         )
 
-        self.expected_df_2 = pd.DataFrame(
+        cls.expected_df_2 = pd.DataFrame(
             {
                 "String Metric 1": ["string_1", "string_2"],
                 "Scalar Metric 1": [2, 0],
                 "Timestamp": [ts1, ts2],
-                "Date": [
-                    conv.convert_timestamp(ts1),
-                    conv.convert_timestamp(ts2),
-                ],
+                "Date": ["2023-04-06 01:12:39", "2023-05-15 20:18:15"],
                 "ID": ["id3", "id2"],
                 "Notes": ["Note 1", "Note 2"],
             }
         )
 
-        self.parsing_options = conv.ParsingOptions()
+        cls.parsing_options = conv.ParsingOptions()
+
+    def setUp(self):
+        # write the output files into a fresh directory for every test, which
+        # is removed with its contents afterwards
+        output_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(output_dir.cleanup)
+        self.output_dir = output_dir.name
 
     def test_parse_json(self):
         reflections_map = conv.parse_json(
@@ -361,27 +550,222 @@ class TestJsonToCsvParsing(unittest.TestCase):
         actual_df_1 = reflections_map["Reflection2"]
         actual_df_2 = reflections_map["Reflection1"]
         assert_frame_equal(actual_df_1, self.expected_df_1, check_like=True)
-
-        print("expected")
-        print(self.expected_df_2)
-        print("actual")
-        print(actual_df_2)
         assert_frame_equal(actual_df_2, self.expected_df_2, check_like=True)
 
+    def test_parse_json_str(self):
+        reflections_map = conv.parse_json(
+            self.json_string.decode(), self.parsing_options
+        )
+        assert_frame_equal(
+            reflections_map["Reflection1"], self.expected_df_2, check_like=True
+        )
+
+    def test_parse_json_metric_names(self):
+        reflections_map = conv.parse_json(
+            self.json_string,
+            self.parsing_options,
+            metric_names=["String Metric 1"],
+        )
+        expected_df_2 = self.expected_df_2.drop(columns="Scalar Metric 1")
+        assert_frame_equal(
+            reflections_map["Reflection1"], expected_df_2, check_like=True
+        )
+        self.assertListEqual(
+            list(reflections_map["Reflection2"].columns),
+            ["Timestamp", "Date", "ID", "Notes"],
+        )
+
+    def test_parse_json_categorical_threshold(self):
+        def reflection(name, notes, *metrics):
+            return {
+                "id": notes,
+                "notes": notes,
+                "name": name,
+                "metrics": [
+                    {"kind": {kind: {"name": metric, kind: value}}}
+                    for metric, kind, value in metrics
+                ],
+                "date": 707954444.948071,
+            }
+
+        reflections = json.loads(self.json_string) + [
+            reflection(
+                "Reflection1",
+                "Note 4",
+                ("String Metric 1", "string", "string_1"),
+            ),
+            reflection(
+                "Reflection1",
+                "Note 5",
+                ("String Metric 1", "string", "string_1"),
+            ),
+            reflection(
+                "Reflection2",
+                "Note 6",
+                ("String Metric 3", "string", "other_string"),
+                ("Choice Metric", "choice", "choice1"),
+            ),
+            reflection(
+                "Reflection3",
+                "Note 7",
+                ("Choice Metric", "choice", ["choice1", "choice2"]),
+            ),
+            reflection(
+                "Reflection3",
+                "Note 8",
+                ("Choice Metric", "choice", ["choice1", "choice2"]),
+            ),
+        ]
+        parsing_options = conv.ParsingOptions()
+        parsing_options.categorical_threshold = 0.8
+        reflections_map = conv.parse_json(reflections, parsing_options)
+
+        # 2 distinct strings in 4 rows, 1 distinct choice in 2 rows
+        df_1 = reflections_map["Reflection1"]
+        df_2 = reflections_map["Reflection2"]
+        self.assertIsInstance(df_1["String Metric 1"].dtype, pd.CategoricalDtype)
+        self.assertListEqual(
+            list(df_1["String Metric 1"]),
+            ["string_1", "string_2", "string_1", "string_1"],
+        )
+        self.assertIsInstance(df_2["Choice Metric"].dtype, pd.CategoricalDtype)
+        self.assertListEqual(list(df_2["Choice Metric"]), ["choice1"] * 2)
+
+        # distinct values above the threshold, non-text metrics and unhashable
+        # lists of choices are kept as they are
+        for df, column in [
+            (df_1, "Notes"),
+            (df_1, "Scalar Metric 1"),
+            (df_2, "String Metric 3"),
+            (df_2, "Notes"),
+            (reflections_map["Reflection3"], "Choice Metric"),
+        ]:
+            with self.subTest(column=column):
+                self.assertNotIsInstance(df[column].dtype, pd.CategoricalDtype)
+        self.assertListEqual(
+            list(reflections_map["Reflection3"]["Choice Metric"]),
+            [["choice1", "choice2"]] * 2,
+        )
+
+    def assertReflectionsMapEqual(self, actual, expected):
+        self.assertListEqual(sorted(actual), sorted(expected))
+        for name in expected:
+            assert_frame_equal(actual[name], expected[name])
+
+    def test_parse_json_file(self):
+        json_path = os.path.join(self.output_dir, "reflections.json")
+        with open(json_path, "wb") as f:
+            f.write(self.json_string)
+        self.assertReflectionsMapEqual(
+            conv.parse_json_file(json_path, self.parsing_options),
+            conv.parse_json(self.json_string, self.parsing_options),
+        )
+
+    @unittest.skipIf(conv.ijson is None, "ijson is not installed")
+    def test_parse_json_stream(self):
+        json_path = os.path.join(self.output_dir, "reflections.json")
+        with open(json_path, "wb") as f:
+            f.write(self.json_string)
+        expected = conv.parse_json(self.json_string, self.parsing_options)
+
+        with self.subTest(json_file="path"):
+            actual = conv.parse_json_stream(json_path, self.parsing_options)
+            self.assertReflectionsMapEqual(actual, expected)
+        with self.subTest(json_file="BytesIO"):
+            actual = conv.parse_json_stream(
+                io.BytesIO(self.json_string), self.parsing_options
+            )
+            self.assertReflectionsMapEqual(actual, expected)
+
     def test_save_dataframes_to_csv(self):
         reflections_map = {
             "Reflection2": self.expected_df_1,
             "Reflection1": self.expected_df_2,
         }
-        conv.save_dataframes_to_csv(reflections_map, ".")
-        self.assertTrue(os.path.exists("Reflection2.csv"))
-        self.assertTrue(os.path.exists("Reflection1.csv"))
-
-    def tearDown(self):
-        if os.path.exists("Reflection2.csv"):
-            os.remove("Reflection2.csv")
-        if os.path.exists("Reflection1.csv"):
-            os.remove("Reflection1.csv")
+        conv.save_dataframes_to_csv(reflections_map, self.output_dir)
+        self.assertTrue(
+            os.path.exists(os.path.join(self.output_dir, "Reflection2.csv"))
+        )
+        self.assertTrue(
+            os.path.exists(os.path.join(self.output_dir, "Reflection1.csv"))
+        )
+
+    def test_save_dataframes_to_csv_filter_list(self):
+        reflections_map = {
+            "Reflection2": self.expected_df_1,
+            "Reflection1": self.expected_df_2,
+        }
+        conv.save_dataframes_to_csv(
+            reflections_map,
+            self.output_dir,
+            filter_list=["Reflection1", "Missing", "Reflection1"],
+        )
+        self.assertListEqual(os.listdir(self.output_dir), ["Reflection1.csv"])
+
+    @unittest.skipIf(conv.pa is None, "pyarrow is not installed")
+    def test_save_dataframes_to_csv_pyarrow(self):
+        reflections_map = {"Reflection2": self.expected_df_1}
+        conv.save_dataframes_to_csv(
+            reflections_map, self.output_dir, engine="pyarrow"
+        )
+        assert_frame_equal(
+            pd.read_csv(os.path.join(self.output_dir, "Reflection2.csv")),
+            self.expected_df_1,
+        )
+
+        # mixed kinds and lists of choices are written like the pandas engine
+        reflections_map = conv.parse_json(
+            KIND_CHANGE_REFLECTIONS + LIST_CHOICE_REFLECTIONS,
+            self.parsing_options,
+        )
+        conv.save_dataframes_to_csv(
+            reflections_map, self.output_dir, engine="pyarrow"
+        )
+        df = pd.read_csv(
+            os.path.join(self.output_dir, "Energy.csv"), dtype=str
+        )
+        self.assertListEqual(list(df["Energy"]), ["3", "True"])
+        df = pd.read_csv(
+            os.path.join(self.output_dir, "Activities.csv"), dtype=str
+        )
+        self.assertListEqual(
+            list(df["Activity"]), ["['run', 'swim']", "['bike']"]
+        )
+
+    def test_save_dataframes_to_csv_invalid_engine(self):
+        reflections_map = {"Reflection2": self.expected_df_1}
+        with self.assertRaises(ValueError):
+            conv.save_dataframes_to_csv(
+                reflections_map, self.output_dir, engine="bogus"
+            )
+
+    @unittest.skipIf(conv.pa is None, "pyarrow is not installed")
+    def test_save_dataframes_to_parquet(self):
+        reflections_map = {
+            "Reflection2": self.expected_df_1,
+            "Reflection1": self.expected_df_2,
+        }
+        conv.save_dataframes_to_parquet(
+            reflections_map, self.output_dir, filter_list=["Reflection1"]
+        )
+        self.assertFalse(
+            os.path.exists(os.path.join(self.output_dir, "Reflection2.parquet"))
+        )
+        assert_frame_equal(
+            pd.read_parquet(os.path.join(self.output_dir, "Reflection1.parquet")),
+            self.expected_df_2,
+        )
+
+    @unittest.skipIf(conv.pa is None, "pyarrow is not installed")
+    def test_save_dataframes_to_parquet_kind_change(self):
+        reflections_map = conv.parse_json(
+            KIND_CHANGE_REFLECTIONS, self.parsing_options
+        )
+        conv.save_dataframes_to_parquet(reflections_map, self.output_dir)
+        df = pd.read_parquet(os.path.join(self.output_dir, "Energy.parquet"))
+        # the mixed values are stored as strings
+        self.assertListEqual(list(df["Energy"]), ["3", "True"])
+        self.assertListEqual(list(df["ID"]), ["id1", "id2"])
 
 
 if __name__ == "__main__":
@@ -4,36 +4,49 @@ import numpy as np
 from reflect import utils as utils
 
 
+OUTLIER_DATE = pd.Timestamp("2020-01-15")
+
+
 class TestFindOutliers(unittest.TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """Create some test data for the tests"""
         date_range = pd.date_range(start="1/1/2020", end="1/31/2020")
-        np.random.seed(0)
-        data = np.random.randint(3, 5, size=(len(date_range), 3))
-        self.df = pd.DataFrame(data, columns=["Elated", "Meh", "Shocked"])
-        self.df["Date"] = date_range
-        self.df.set_index("Date", inplace=True)
+        rng = np.random.default_rng(0)
+        data = rng.integers(3, 5, size=(len(date_range), 3))
+        cls.base_df = pd.DataFrame(
+            data,
+            index=pd.Index(date_range, name="Date"),
+            columns=["Elated", "Meh", "Shocked"],
+        )
+
+        # Introduce an outlier, and detect the outliers with a weekly window
+        # once for the tests which share this setup
+        cls.outlier_df = cls.base_df.copy()
+        cls.outlier_df.at[OUTLIER_DATE, "Elated"] = 0
+        cls.weekly_outliers = utils.find_outliers(cls.outlier_df, "7D")
+
+    def setUp(self):
+        # the tests introduce outliers into their own copy of the data
+        self.df = self.base_df.copy()
 
     def test_no_outliers(self):
         """Test that function returns a dataframe of all NaNs when there are no
         outliers
         """
         df_outliers = utils.find_outliers(self.df, "3D")
-        self.assertTrue(df_outliers.isna().all().all())
+        self.assertTrue(pd.isna(df_outliers.to_numpy()).all())
 
     def test_outliers_identified(self):
         """Test that function correctly identifies outliers"""
-        # Introduce an outlier
-        self.df.loc["2020-01-15", "Elated"] = 0
-        df_outliers = utils.find_outliers(self.df, "7D")
-        self.assertEqual(df_outliers.loc["2020-01-15", "Elated"], 0)
+        self.assertEqual(self.weekly_outliers.at[OUTLIER_DATE, "Elated"], 0)
 
     def test_center_argument(self):
         """Test the effect of the center argument"""
 
         # Set everything after 2020-01-15 to zero which introduces a stepwise
         # change in the data
-        self.df.loc["2020-01-15":, "Elated"] = 0
+        self.df.loc[OUTLIER_DATE:, "Elated"] = 0
         # Without centering
         df_outliers_no_center = utils.find_outliers(
             self.df, "7D", center=False
@@ -43,23 +56,27 @@ class TestFindOutliers(unittest.TestCase):
 
         # Expect that 2020-01-15 will be treated as an outlier when considering
         # the window of the week up to that data point
-        self.assertEqual(df_outliers_no_center.loc["2020-01-15", "Elated"], 0)
+        self.assertEqual(df_outliers_no_center.at[OUTLIER_DATE, "Elated"], 0)
         # If the outlier detection is forward looking, it is not treated as an
         # outlier, as the following values in the dataset are all zero
         self.assertNotIn("Elated", df_outliers_center.columns)
 
     def test_time_window(self):
         """Test the effect of the time window"""
-        # Introduce an outlier
-        self.df.loc["2020-01-15", "Elated"] = 0
-        # Smaller time window
-        df_outliers_small_window = utils.find_outliers(self.df, "7D")
-        # Larger time window
-        df_outliers_large_window = utils.find_outliers(self.df, "14D")
-        # This is a significant outlier and should be picked up in both cases
+        # The weekly result is shared with test_outliers_identified
+        outliers_by_window = {"7D": self.weekly_outliers}
+        for time_window in ("14D", "21D"):
+            outliers_by_window[time_window] = utils.find_outliers(
+                self.outlier_df, time_window
+            )
+
+        # This is a significant outlier and should be picked up in all cases
+        for time_window, df_outliers in outliers_by_window.items():
+            with self.subTest(time_window=time_window):
+                self.assertEqual(df_outliers.at[OUTLIER_DATE, "Elated"], 0)
         self.assertEqual(
-            df_outliers_small_window.loc["2020-01-15", "Elated"],
-            df_outliers_large_window.loc["2020-01-15", "Elated"],
+            outliers_by_window["7D"].at[OUTLIER_DATE, "Elated"],
+            outliers_by_window["14D"].at[OUTLIER_DATE, "Elated"],
         )
 
 
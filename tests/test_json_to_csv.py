@@ -0,0 +1,130 @@
+import unittest
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import time
+from unittest import mock
+
+import pandas as pd
+
+from reflect import conversions as conv
+
+SCRIPT_PATH = os.path.join(
+    os.path.dirname(__file__), os.pardir, "scripts", "json_to_csv.py"
+)
+spec = importlib.util.spec_from_file_location("json_to_csv", SCRIPT_PATH)
+json_to_csv = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(json_to_csv)
+
+# The second reflection does not record the scalar metric, so the exported
+# value depends on the defaults in the options file
+REFLECTIONS = [
+    {
+        "id": "id1",
+        "name": "Reflection1",
+        "metrics": [{"kind": {"scalar": {"name": "Scalar Metric", "scalar": 2}}}],
+        "date": 702429159.13179898,
+    },
+    {
+        "id": "id2",
+        "name": "Reflection1",
+        "metrics": [{"kind": {"scalar": {"name": "Scalar Metric"}}}],
+        "date": 705867495.55896401,
+    },
+]
+
+
+class TestParseCache(unittest.TestCase):
+    """
+    Tests the cache of parsed reflections used by `json_to_csv.py --cache`.
+    """
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = tmp_dir.name
+
+        # keep the cache entries out of the user's cache directory
+        patcher = mock.patch.dict(
+            os.environ, {"XDG_CACHE_HOME": os.path.join(self.tmp_dir, "cache")}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.json_path = os.path.join(self.tmp_dir, "reflections.json")
+        with open(self.json_path, "w") as f:
+            json.dump(REFLECTIONS, f)
+        self.options_path = os.path.join(self.tmp_dir, "options.yaml")
+        with open(self.options_path, "w") as f:
+            f.write("defaults:\n  scalar: 1\n")
+        self.output_dir = os.path.join(self.tmp_dir, "output")
+        os.mkdir(self.output_dir)
+
+    def run_script(self, *args):
+        argv = ["json_to_csv.py", self.json_path, self.output_dir, *args]
+        with mock.patch.object(sys, "argv", argv):
+            json_to_csv.main()
+
+    def test_cache_hit(self):
+        self.run_script("--cache")
+        with mock.patch.object(
+            conv, "parse_json_file", side_effect=AssertionError("parsed")
+        ):
+            self.run_script("--cache")
+        self.assertTrue(
+            os.path.exists(os.path.join(self.output_dir, "Reflection1.csv"))
+        )
+
+    def test_options_file(self):
+        self.run_script("-o", self.options_path)
+        df = pd.read_csv(os.path.join(self.output_dir, "Reflection1.csv"))
+        # the unrecorded value takes the scalar default from the options file
+        self.assertListEqual(list(df["Scalar Metric"]), [2, 1])
+
+    def test_cache_miss_after_options_change(self):
+        cache_path = json_to_csv.get_cache_path(
+            self.json_path, self.options_path
+        )
+        with open(self.options_path, "w") as f:
+            f.write("defaults:\n  scalar: 2\n")
+        self.assertNotEqual(
+            json_to_csv.get_cache_path(self.json_path, self.options_path),
+            cache_path,
+        )
+
+    @unittest.skipUnless(hasattr(time, "tzset"), "time.tzset is not available")
+    def test_cache_miss_after_timezone_change(self):
+        def set_timezone(name):
+            os.environ["TZ"] = name
+            time.tzset()
+
+        old_timezone = os.environ.get("TZ")
+        self.addCleanup(time.tzset)
+        if old_timezone is None:
+            self.addCleanup(os.environ.pop, "TZ", None)
+        else:
+            self.addCleanup(os.environ.__setitem__, "TZ", old_timezone)
+
+        set_timezone("UTC")
+        cache_path = json_to_csv.get_cache_path(self.json_path)
+        set_timezone("Europe/Berlin")
+        self.assertNotEqual(
+            json_to_csv.get_cache_path(self.json_path), cache_path
+        )
+
+    def test_corrupt_cache_file(self):
+        cache_path = json_to_csv.get_cache_path(self.json_path)
+        os.makedirs(os.path.dirname(cache_path))
+        with open(cache_path, "wb") as f:
+            f.write(b"\x80\x05not a pickle")
+        self.assertIsNone(json_to_csv.load_cache(cache_path))
+
+        # the script parses the file again and replaces the corrupt entry
+        self.run_script("--cache")
+        self.assertIn("Reflection1", json_to_csv.load_cache(cache_path))
+
+
+if __name__ == "__main__":
+    unittest.main()